@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 
-import os
+import shutil
+import subprocess
+from pathlib import Path
+
+TRAINING_DIR = Path('denoiser/training')
+BINARY = Path('target/release/main')
 
 output_counter = 0
 
 def perform_capture(cx, cy, cz, ch, cp, sa):
     global output_counter
-    os.system('cargo run ' + ' '.join([str(e) for e in [cx, cy, cz, ch, cp, sa]]))
-    os.system('rm -r denoiser/training/' + str(output_counter))
-    os.system('mkdir denoiser/training/' + str(output_counter))
-    os.system('mv denoiser/training/*.dat denoiser/training/' + str(output_counter))
+    subprocess.run([str(BINARY)] + [str(e) for e in [cx, cy, cz, ch, cp, sa]], check=True)
+    target = TRAINING_DIR / str(output_counter)
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+    for piece in TRAINING_DIR.glob('*.dat'):
+        piece.rename(target / piece.name)
     output_counter += 1
 
 positions = [
@@ -38,8 +46,12 @@ suns = [
     1.2,
 ]
 
+# Build once up front; invoking the binary directly afterwards skips cargo's
+# per-run dependency graph walk.
+subprocess.run(['cargo', 'build', '--release'], check=True)
+
 for position in positions:
     for angle in angles:
         for sun in suns:
             args = position + angle + [sun]
-            perform_capture(*args)
\ No newline at end of file
+            perform_capture(*args)
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+
+# Views and filters the raw framebuffer dumps that captures leave in
+# denoiser/training/. A dump is a series of 512x512 RGBA8 groups packed back
+# to back, so channel index c refers to component c % 4 of group c // 4.
+# Packed 16 bit depth occupies two consecutive channels (low byte first.)
+#
+# Images are handled as channels-first (C, 512, 512) float32 arrays so every
+# channel is one dense, unit-stride plane.
+#
+# Usage:
+#   ./denoiser/dat_viewer.py view FILE R G B
+#   ./denoiser/dat_viewer.py average FOLDER LOW HIGH R G B
+#   ./denoiser/dat_viewer.py blur FILE R G B
+#   ./denoiser/dat_viewer.py bilateral FILE R G B
+#   ./denoiser/dat_viewer.py depth_bilateral FILE R G B NX NY NZ DLO DHI
+
+import math
+import sys
+
+import numpy as np
+from matplotlib import pyplot
+from scipy import ndimage
+
+# Numba is optional; without it the filters fall back to the vectorized
+# separable passes.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+SIZE = 512
+GAUSSIAN_RADIUS = 16
+
+
+def get_channel_offset(channel):
+    # The group size is a power of two, so shift/mask instead of the slower
+    # CPython division and modulo.
+    return channel >> 2, channel & 3
+
+
+def load_image(filename, channels):
+    # One frombuffer + reshape decodes the whole dump, then each requested
+    # channel is pulled out as a full 512x512 plane instead of looping over
+    # every byte. The dump stores the bottom row first, so flip to get Y up.
+    data = np.frombuffer(open(filename, 'rb').read(), dtype=np.uint8)
+    data = data.reshape(-1, SIZE, SIZE, 4)
+    planes = []
+    for channel in channels:
+        group, component = get_channel_offset(channel)
+        planes.append(data[group, :, :, component])
+    image = np.stack(planes, axis=0).astype(np.float32)
+    image = (image * (1.0 / 255.0)) ** 0.4
+    return np.ascontiguousarray(image[:, ::-1])
+
+
+def load_raw_image(filename, channels):
+    # Like load_image but keeps the raw byte values, for channels that are not
+    # colors (packed depth, encoded normals.)
+    data = np.frombuffer(open(filename, 'rb').read(), dtype=np.uint8)
+    data = data.reshape(-1, SIZE, SIZE, 4)
+    planes = []
+    for channel in channels:
+        group, component = get_channel_offset(channel)
+        planes.append(data[group, :, :, component])
+    image = np.stack(planes, axis=0).astype(np.float32)
+    return np.ascontiguousarray(image[:, ::-1])
+
+
+# sqrt of every possible packed 16 bit depth value, tabulated once at import
+# so unpacking a whole plane is a single gather instead of 262144 sqrts.
+DEPTH_LUT = np.sqrt(np.arange(65536)).astype(np.float32)
+
+# 1 / (x + 1) for the bilateral range weight, indexed by the quantized sum of
+# the scaled depth and normal differences.
+RANGE_LUT = 1.0 / (np.arange(256, dtype=np.float32) + 1.0)
+
+
+def vec_distance_sq(a, b):
+    return ((a - b) ** 2).sum(axis=0) * (1.0 / 3.0)
+
+
+def unpack_depth(image):
+    packed = image[-1].astype(np.int32) * 256 + image[-2].astype(np.int32)
+    return DEPTH_LUT[packed]
+
+
+def gaussian(x, y, size):
+    return math.exp(-3.0 * (x * x + y * y) / (size * size))
+
+
+# One row of the gaussian; the full 2D weight is SPATIAL[dy] * SPATIAL[dx]
+# since the kernel is separable.
+SPATIAL = np.exp(
+    -3.0 * np.arange(-GAUSSIAN_RADIUS, GAUSSIAN_RADIUS + 1) ** 2
+    / GAUSSIAN_RADIUS ** 2).astype(np.float32)
+
+
+def make_taps(size):
+    taps = []
+    for dx in range(-size, size + 1):
+        for dy in range(-size, size + 1):
+            taps.append((dx, dy, gaussian(dx, dy, size)))
+    return taps
+
+
+gaussian_taps = make_taps(GAUSSIAN_RADIUS)
+# The taps as three parallel arrays: integer offsets index without a per-tap
+# float cast, and the kernels can keep all three hot in cache/registers.
+TAP_DX = np.array([tap[0] for tap in gaussian_taps], dtype=np.int32)
+TAP_DY = np.array([tap[1] for tap in gaussian_taps], dtype=np.int32)
+TAP_W = np.array([tap[2] for tap in gaussian_taps], dtype=np.float32)
+
+
+def box_blur_5x(image):
+    # scipy applies this as two separable 1D box passes per plane; size 1 on
+    # the channel axis leaves the planes independent.
+    return ndimage.uniform_filter(image, size=(1, 5, 5))
+
+
+if njit is not None:
+    # The compiled kernels run the exact 2D tap square; prange parallelizes
+    # over rows and the scalar arithmetic lets LLVM vectorize the tap loop.
+    @njit(parallel=True, fastmath=True)
+    def color_bilinear_kernel(color, tap_dx, tap_dy, tap_w, out):
+        height = color.shape[1]
+        width = color.shape[2]
+        tap_count = tap_dx.shape[0]
+        for y in prange(height):
+            for x in range(width):
+                center_r = color[0, y, x]
+                center_g = color[1, y, x]
+                center_b = color[2, y, x]
+                total_r = 0.0
+                total_g = 0.0
+                total_b = 0.0
+                total_weight = 0.0
+                for i in range(tap_count):
+                    sx = x + tap_dx[i]
+                    sy = y + tap_dy[i]
+                    if sx < 0:
+                        sx = 0
+                    if sx > width - 1:
+                        sx = width - 1
+                    if sy < 0:
+                        sy = 0
+                    if sy > height - 1:
+                        sy = height - 1
+                    dr = color[0, sy, sx] - center_r
+                    dg = color[1, sy, sx] - center_g
+                    db = color[2, sy, sx] - center_b
+                    difference = (100.0 / 3.0) * (dr * dr + dg * dg + db * db)
+                    weight = tap_w[i] / (difference + 1.0)
+                    total_r += color[0, sy, sx] * weight
+                    total_g += color[1, sy, sx] * weight
+                    total_b += color[2, sy, sx] * weight
+                    total_weight += weight
+                out[0, y, x] = total_r / total_weight
+                out[1, y, x] = total_g / total_weight
+                out[2, y, x] = total_b / total_weight
+
+    @njit(parallel=True, fastmath=True)
+    def depth_bilinear_kernel(color, depth, normal, tap_dx, tap_dy, tap_w, out):
+        height = color.shape[1]
+        width = color.shape[2]
+        tap_count = tap_dx.shape[0]
+        for y in prange(height):
+            for x in range(width):
+                center_depth = depth[y, x]
+                center_nx = normal[0, y, x]
+                center_ny = normal[1, y, x]
+                center_nz = normal[2, y, x]
+                total_r = 0.0
+                total_g = 0.0
+                total_b = 0.0
+                total_weight = 0.0
+                for i in range(tap_count):
+                    sx = x + tap_dx[i]
+                    sy = y + tap_dy[i]
+                    if sx < 0:
+                        sx = 0
+                    if sx > width - 1:
+                        sx = width - 1
+                    if sy < 0:
+                        sy = 0
+                    if sy > height - 1:
+                        sy = height - 1
+                    dd = center_depth - depth[sy, sx]
+                    depth_difference = 25.0 * dd * dd
+                    dnx = normal[0, sy, sx] - center_nx
+                    dny = normal[1, sy, sx] - center_ny
+                    dnz = normal[2, sy, sx] - center_nz
+                    normal_difference = (400.0 / 3.0) * (dnx * dnx + dny * dny + dnz * dnz)
+                    weight = tap_w[i] / (depth_difference + normal_difference + 1.0)
+                    total_r += color[0, sy, sx] * weight
+                    total_g += color[1, sy, sx] * weight
+                    total_b += color[2, sy, sx] * weight
+                    total_weight += weight
+                out[0, y, x] = total_r / total_weight
+                out[1, y, x] = total_g / total_weight
+                out[2, y, x] = total_b / total_weight
+
+
+def color_bilinear(image):
+    if njit is not None:
+        out = np.empty_like(image)
+        color_bilinear_kernel(image, TAP_DX, TAP_DY, TAP_W, out)
+        return out
+    # Fallback: two 1D passes (horizontal then vertical) instead of the full
+    # 33x33 tap square: O(2k) taps per pixel instead of O(k^2), and every tap
+    # is one whole-plane NumPy op. The range weight is always computed against
+    # the unfiltered image, making the second pass a joint bilateral.
+    color = image
+    for axis in (2, 1):
+        color = color_bilinear_pass(image, color, axis)
+    return color
+
+
+def color_bilinear_pass(image, color, axis):
+    total = np.zeros_like(color)
+    total_weight = np.zeros(color.shape[1:], dtype=np.float32)
+    for d in range(-GAUSSIAN_RADIUS, GAUSSIAN_RADIUS + 1):
+        color_difference = 100.0 * vec_distance_sq(image, np.roll(image, d, axis=axis))
+        quantized = np.minimum(color_difference, 255.0).astype(np.int32)
+        weight = SPATIAL[d + GAUSSIAN_RADIUS] * RANGE_LUT[quantized]
+        total += np.roll(color, d, axis=axis) * weight
+        total_weight += weight
+    return total / total_weight
+
+
+def depth_bilinear(image):
+    if njit is not None:
+        color = np.ascontiguousarray(image[:3])
+        normal = np.ascontiguousarray(image[3:6])
+        out = np.empty_like(color)
+        depth_bilinear_kernel(color, unpack_depth(image), normal, TAP_DX, TAP_DY, TAP_W, out)
+        return out
+    # The guide planes are shared by both passes, so unpack them once.
+    color = image[:3]
+    depth = unpack_depth(image)
+    normal = image[3:6]
+    for axis in (2, 1):
+        color = depth_bilinear_pass(depth, normal, color, axis)
+    return color
+
+
+def depth_bilinear_pass(depth, normal, color, axis):
+    total = np.zeros_like(color)
+    total_weight = np.zeros(color.shape[1:], dtype=np.float32)
+    for d in range(-GAUSSIAN_RADIUS, GAUSSIAN_RADIUS + 1):
+        # depth is a bare 2D plane, so its roll axis is off by one.
+        depth_difference = 25.0 * np.square(depth - np.roll(depth, d, axis=axis - 1))
+        normal_difference = 400.0 * vec_distance_sq(normal, np.roll(normal, d, axis=axis))
+        quantized = np.minimum(depth_difference + normal_difference, 255.0).astype(np.int32)
+        weight = SPATIAL[d + GAUSSIAN_RADIUS] * RANGE_LUT[quantized]
+        total += np.roll(color, d, axis=axis) * weight
+        total_weight += weight
+    return total / total_weight
+
+
+def show_image(image):
+    array = image.transpose(1, 2, 0) * (1.0 / 255.0)
+    np.power(array, 0.4, out=array)
+    pyplot.imshow(array)
+    pyplot.show()
+
+
+def command_view(args):
+    image = load_raw_image(args[0], [int(arg) for arg in args[1:4]])
+    show_image(image)
+
+
+def command_average(args):
+    # Averages frames LOW..HIGH of one capture folder. Every frame lands in a
+    # single preallocated float32 accumulator, so each dump costs one
+    # vectorized add instead of a quarter million Python loop iterations.
+    folder = args[0]
+    low = int(args[1])
+    high = int(args[2])
+    channels = [int(arg) for arg in args[3:6]]
+    acc = np.zeros((3, SIZE, SIZE), dtype=np.float32)
+    for index in range(low, high + 1):
+        acc += load_image(folder + '/' + str(index) + '.dat', channels)
+    acc *= 1.0 / (high + 1 - low)
+    pyplot.imshow(acc.transpose(1, 2, 0))
+    pyplot.show()
+
+
+def command_blur(args):
+    image = load_raw_image(args[0], [int(arg) for arg in args[1:4]])
+    show_image(box_blur_5x(image))
+
+
+def command_bilateral(args):
+    image = load_raw_image(args[0], [int(arg) for arg in args[1:4]])
+    show_image(color_bilinear(image))
+
+
+def command_depth_bilateral(args):
+    image = load_raw_image(args[0], [int(arg) for arg in args[1:9]])
+    show_image(depth_bilinear(image))
+
+
+if __name__ == '__main__':
+    command = sys.argv[1]
+    args = sys.argv[2:]
+    if command == 'view':
+        command_view(args)
+    elif command == 'average':
+        command_average(args)
+    elif command == 'blur':
+        command_blur(args)
+    elif command == 'bilateral':
+        command_bilateral(args)
+    elif command == 'depth_bilateral':
+        command_depth_bilateral(args)
+    else:
+        print('Unknown command ' + command)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+# Trains the denoiser network on the captures in denoiser/training/. Each
+# capture folder provides a noisy single-sample frame (noisy.dat) and an
+# averaged ground truth (truth.dat, built with dat_viewer's average command.)
+# The network sees a 64x64 noisy crop and predicts the residual against the
+# truth over the central region, encoded into 0..1.
+
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import mixed_precision
+
+# Convolutions run in float16 (Tensor Core friendly) while the layer
+# variables stay float32.
+mixed_precision.set_global_policy('mixed_float16')
+
+TRAINING_DIR = 'denoiser/training'
+CROP_SIZE = 64
+BORDER = 8
+OUTPUT_SIZE = CROP_SIZE - BORDER * 2
+CROPS_PER_EPOCH = 2048
+BATCH_SIZE = 128
+EPOCHS = 2000
+
+
+def import_file(filename):
+    # [..., :3] views away the alpha channel where np.delete would copy the
+    # whole array; the astype then materializes just the three kept planes.
+    array = np.fromfile(filename, dtype=np.uint8).reshape(512, 512, 4)[..., :3]
+    return array.astype(np.float16) * np.float16(1.0 / 256.0)
+
+
+CACHE_FILE = os.path.join(TRAINING_DIR, 'training_cache.f16.bin')
+FILE_SHAPE = (2, 512, 512, 3)
+
+
+def build_cache():
+    count = 0
+    while os.path.exists(os.path.join(TRAINING_DIR, str(count))):
+        count += 1
+    cache = np.memmap(CACHE_FILE, dtype=np.float16, mode='w+',
+                      shape=(count,) + FILE_SHAPE)
+    for index in range(count):
+        folder = os.path.join(TRAINING_DIR, str(index))
+        cache[index, 0] = import_file(os.path.join(folder, 'truth.dat'))
+        cache[index, 1] = import_file(os.path.join(folder, 'noisy.dat'))
+    cache.flush()
+
+
+def import_files():
+    # The whole training set lives in one flat half-precision tensor on disk.
+    # After the first run, startup is a single mmap instead of decoding ~350
+    # dumps into separate arrays, and the OS pages crops in on demand.
+    if not os.path.exists(CACHE_FILE):
+        build_cache()
+    count = os.path.getsize(CACHE_FILE) // (np.prod(FILE_SHAPE) * 2)
+    return np.memmap(CACHE_FILE, dtype=np.float16, mode='r',
+                     shape=(int(count),) + FILE_SHAPE)
+
+
+rng = np.random.default_rng()
+
+
+def random_crops(files, count):
+    # All crops for one call come from a single randomly chosen file. The
+    # sliding_window_view calls are zero-copy strided views over that file,
+    # so the whole batch is gathered with one fancy index per tensor instead
+    # of `count` Python-level slice-and-copy iterations; nothing is
+    # materialized until the final ascontiguousarray.
+    truth, noisy = files[rng.integers(len(files))]
+    windows_noisy = sliding_window_view(noisy, (CROP_SIZE, CROP_SIZE, 3))[:, :, 0]
+    windows_truth = sliding_window_view(truth, (OUTPUT_SIZE, OUTPUT_SIZE, 3))[:, :, 0]
+    xs = rng.integers(0, 512 - CROP_SIZE, count)
+    ys = rng.integers(0, 512 - CROP_SIZE, count)
+    noisies = np.ascontiguousarray(windows_noisy[xs, ys], dtype=np.float16)
+    truths = np.ascontiguousarray(windows_truth[xs + BORDER, ys + BORDER], dtype=np.float16)
+    residuals = (noisies[:, BORDER:-BORDER, BORDER:-BORDER] - truths + 1.0) * 0.5
+    return noisies, residuals, truths
+
+
+def crop_batches(files):
+    # Generates a fresh pool of crops per epoch and serves it in batch
+    # slices; tf.data runs this on its own thread and prefetches so the GPU
+    # never waits on crop generation.
+    while True:
+        noisies, residuals, truths = random_crops(files, CROPS_PER_EPOCH)
+        for low in range(0, CROPS_PER_EPOCH, BATCH_SIZE):
+            yield noisies[low:low + BATCH_SIZE], residuals[low:low + BATCH_SIZE]
+
+
+def build_model():
+    # Depthwise-separable convs: same receptive field as a full 3x3 conv at
+    # roughly a ninth of the multiplies.
+    inputs = keras.Input(shape=(CROP_SIZE, CROP_SIZE, 3))
+    conv1 = keras.layers.SeparableConv2D(32, 3, padding='same', activation='relu')(inputs)
+    conv1 = keras.layers.SeparableConv2D(32, 3, padding='same', activation='relu')(conv1)
+    down = keras.layers.MaxPooling2D(2)(conv1)
+    conv2 = keras.layers.SeparableConv2D(64, 3, padding='same', activation='relu')(down)
+    conv2 = keras.layers.SeparableConv2D(64, 3, padding='same', activation='relu')(conv2)
+    up = keras.layers.UpSampling2D(2)(conv2)
+    conv3 = keras.layers.SeparableConv2D(32, 3, padding='same', activation='relu')(
+        keras.layers.Concatenate()([conv1, up]))
+    # The output layers stay float32 so the loss is computed at full
+    # precision.
+    outputs = keras.layers.Conv2D(3, 3, padding='same', dtype='float32')(conv3)
+    outputs = keras.layers.Cropping2D(BORDER, dtype='float32')(outputs)
+    return keras.Model(inputs, outputs)
+
+
+if __name__ == '__main__':
+    files = import_files()
+    model = build_model()
+    # XLA fuses the many small conv/relu/concat kernels into a few compiled
+    # clusters, cutting launch overhead and memory round-trips between layers.
+    model.compile(optimizer='adam', loss='mse', jit_compile=True)
+    dataset = tf.data.Dataset.from_generator(
+        lambda: crop_batches(files),
+        output_signature=(
+            tf.TensorSpec((BATCH_SIZE, CROP_SIZE, CROP_SIZE, 3), tf.float16),
+            tf.TensorSpec((BATCH_SIZE, OUTPUT_SIZE, OUTPUT_SIZE, 3), tf.float16)))
+    model.fit(
+        dataset.prefetch(8),
+        steps_per_epoch=CROPS_PER_EPOCH // BATCH_SIZE,
+        epochs=EPOCHS,
+        callbacks=[keras.callbacks.ModelCheckpoint('denoiser/model.h5')])